@@ -6,7 +6,7 @@ from flask_restx import Namespace, Resource
 from CTFd.api.v1.helpers.request import validate_args
 from CTFd.api.v1.helpers.schemas import sqlalchemy_to_pydantic
 from CTFd.api.v1.schemas import APIDetailedSuccessResponse, APIListSuccessResponse
-from CTFd.cache import clear_standings
+from CTFd.cache import invalidate
 from CTFd.constants import RawEnum
 from CTFd.models import Awards, Users, db
 from CTFd.schemas.awards import AwardSchema
@@ -133,7 +133,7 @@ class AwardList(Resource):
         db.session.close()
 
         # Delete standings cache because awards can change scores
-        clear_standings()
+        invalidate("award")
 
         return {"success": True, "data": response.data}
 
@@ -172,6 +172,6 @@ class Award(Resource):
         db.session.close()
 
         # Delete standings cache because awards can change scores
-        clear_standings()
+        invalidate("award")
 
         return {"success": True}
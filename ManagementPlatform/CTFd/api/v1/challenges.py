@@ -16,7 +16,7 @@ from sqlalchemy.sql import and_
 from CTFd.api.v1.helpers.request import validate_args
 from CTFd.api.v1.helpers.schemas import sqlalchemy_to_pydantic
 from CTFd.api.v1.schemas import APIDetailedSuccessResponse, APIListSuccessResponse
-from CTFd.cache import clear_challenges, clear_standings
+from CTFd.cache import clear_challenges, invalidate
 from CTFd.constants import RawEnum
 from CTFd.models import (
     ChallengeFiles as ChallengeFilesModel,
@@ -524,8 +524,7 @@ class Challenge(Resource):
                              notif_title= "Thông báo từ ban quản trị",
                              notif_message= f"Thử thách '{challenge.name}' vừa được cập nhật.")
 
-        clear_standings()
-        clear_challenges()
+        invalidate("challenge_edit")
 
         return {"success": True, "data": response}
 
@@ -551,8 +550,7 @@ class Challenge(Resource):
 
         chal_class = get_chal_class(challenge.type)
         chal_class.delete(challenge)
-        clear_standings()
-        clear_challenges()
+        invalidate("challenge_edit")
         
         notify_to_contestant(notif_type = "toast", 
                              notif_sound = True,
@@ -760,12 +758,16 @@ class ChallengeAttempt(Resource):
                     or current_user.is_challenge_writer()
                     or current_user.is_jury()
                 ):
+                    value = challenge.value
                     chal_class.solve(
                         user=user, team=team, challenge=challenge, request=request
                     )
 
-                    clear_standings()
-                    clear_challenges()
+                    if challenge.value != value:
+                        # e.g. dynamic challenges decay after each solve
+                        invalidate("solve", "challenge_edit")
+                    else:
+                        invalidate("solve")
                     cache_key = generate_cache_attempt_key(challenge_id, team_id)
 
                 log(
@@ -822,8 +824,7 @@ class ChallengeAttempt(Resource):
                     chal_class.fail(
                         user=user, team=team, challenge=challenge, request=request
                     )
-                    clear_standings()
-                    clear_challenges()
+                    invalidate("fail")
 
                 log(
                     "submissions",
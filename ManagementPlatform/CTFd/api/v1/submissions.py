@@ -9,7 +9,7 @@ from CTFd.api.v1.schemas import (
     APIDetailedSuccessResponse,
     PaginatedAPIListSuccessResponse,
 )
-from CTFd.cache import clear_challenges, clear_standings
+from CTFd.cache import invalidate
 from CTFd.constants import RawEnum
 from CTFd.models import Solves, Submissions, Tokens, Users, db
 from CTFd.schemas.submissions import SubmissionSchema
@@ -141,10 +141,8 @@ class SubmissionsList(Resource):
         response = schema.dump(response.data)
         db.session.close()
 
-        # Delete standings cache
-        clear_standings()
-        # Delete challenges cache
-        clear_challenges()
+        # Delete standings and solve caches
+        invalidate("solve")
 
         return {"success": True, "data": response.data}
 
@@ -203,9 +201,8 @@ class Submission(Resource):
             submission.type = "discard"
             db.session.commit()
 
-            # Delete standings cache
-            clear_standings()
-            clear_challenges()
+            # Delete standings and solve caches
+            invalidate("solve")
 
             submission = solve
 
@@ -234,9 +231,8 @@ class Submission(Resource):
         db.session.commit()
         db.session.close()
 
-        # Delete standings cache
-        clear_standings()
-        clear_challenges()
+        # Delete standings and solve caches
+        invalidate("solve")
 
         return {"success": True}
 @submissions_namespace.route("/contestants")
@@ -15,6 +15,7 @@ from CTFd.cache import (
     clear_standings,
     clear_team_session,
     clear_user_session,
+    invalidate,
 )
 from CTFd.constants import RawEnum
 from CTFd.models import Awards, Challenges, Submissions, Teams, Tokens, Unlocks, Users, db
@@ -234,8 +235,7 @@ class TeamPublic(Resource):
         db.session.commit()
 
         clear_team_session(team_id=team.id)
-        clear_standings()
-        clear_challenges()
+        invalidate("account_edit")
 
         db.session.close()
 
@@ -6,7 +6,7 @@ from flask_restx import Namespace, Resource
 from CTFd.api.v1.helpers.request import validate_args
 from CTFd.api.v1.helpers.schemas import sqlalchemy_to_pydantic
 from CTFd.api.v1.schemas import APIDetailedSuccessResponse, APIListSuccessResponse
-from CTFd.cache import clear_standings
+from CTFd.cache import invalidate
 from CTFd.constants import RawEnum
 from CTFd.models import Unlocks,Tokens ,Users ,db, get_class_by_tablename
 from CTFd.schemas.awards import AwardSchema
@@ -168,7 +168,7 @@ class UnlockList(Resource):
         award = award_schema.load(award)
         db.session.add(award.data)
         db.session.commit()
-        clear_standings()
+        invalidate("unlock")
 
         response = schema.dump(response.data)
 
@@ -9,7 +9,12 @@ from CTFd.api.v1.schemas import (
     APIDetailedSuccessResponse,
     PaginatedAPIListSuccessResponse,
 )
-from CTFd.cache import clear_challenges, clear_standings, clear_user_session
+from CTFd.cache import (
+    clear_challenges,
+    clear_standings,
+    clear_user_session,
+    invalidate,
+)
 from CTFd.constants import RawEnum
 from CTFd.models import (
     Awards,
@@ -255,8 +260,7 @@ class UserPublic(Resource):
         db.session.close()
 
         clear_user_session(user_id=user_id)
-        clear_standings()
-        clear_challenges()
+        invalidate("account_edit")
 
         return {"success": True, "data": response.data}
 
@@ -343,8 +347,7 @@ class UserPrivate(Resource):
         response = schema.dump(response.data)
         db.session.close()
 
-        clear_standings()
-        clear_challenges()
+        invalidate("account_edit")
 
         return {"success": True, "data": response.data}
 
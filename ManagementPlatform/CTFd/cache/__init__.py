@@ -146,19 +146,52 @@ def clear_standings():
 
 
 def clear_challenges():
-    from CTFd.utils.challenges import get_all_challenges  # noqa: I001
-    from CTFd.utils.challenges import (
+    from CTFd.utils.challenges import get_all_challenges
+
+    cache.delete_memoized(get_all_challenges)
+    clear_solves()
+
+
+def clear_solves():
+    from CTFd.utils.challenges import (  # noqa: I001
         get_solve_counts_for_challenges,
         get_solve_ids_for_user_id,
         get_solves_for_challenge_id,
     )
 
-    cache.delete_memoized(get_all_challenges)
     cache.delete_memoized(get_solves_for_challenge_id)
     cache.delete_memoized(get_solve_ids_for_user_id)
     cache.delete_memoized(get_solve_counts_for_challenges)
 
 
+# Cache clearing functions affected by each type of event.
+# Only the caches that can actually change are listed so that frequent events stay cheap.
+# e.g. an incorrect submission cannot change standings, solve lists or challenge values.
+INVALIDATIONS = {
+    "fail": (),
+    "solve": (clear_standings, clear_solves),
+    "award": (clear_standings,),
+    "unlock": (clear_standings,),
+    "challenge_edit": (clear_standings, clear_challenges),
+    "account_edit": (clear_standings, clear_solves),
+}
+
+
+def invalidate(*events):
+    """
+    Clear the caches affected by the given events (see INVALIDATIONS).
+    Each clearing function only runs once even if several events share it.
+    :param events:
+    :return:
+    """
+    seen = []
+    for event in events:
+        for func in INVALIDATIONS[event]:
+            if func not in seen:
+                seen.append(func)
+                func()
+
+
 def clear_pages():
     from CTFd.utils.config.pages import get_page, get_pages
 
@@ -90,3 +90,28 @@ def import_ctf(path, delete_import_on_finish=False):
     if delete_import_on_finish:
         print(f"Deleting {path}")
         Path(path).unlink()
+
+
+@_cli.cli.command("rebuild_standings")
+@click.option(
+    "--check",
+    default=False,
+    is_flag=True,
+    help="Only report how many standings rows are out of date",
+)
+def rebuild_standings(check=False):
+    from CTFd.cache import clear_standings
+    from CTFd.models import db
+    from CTFd.utils.scores.standings import rebuild_standings as rebuild_util
+
+    changed = rebuild_util()
+    if check:
+        db.session.rollback()
+        print(f"{changed} standings rows are out of date")
+        if changed:
+            raise SystemExit(1)
+        return
+
+    db.session.commit()
+    clear_standings()
+    print(f"Rebuilt standings ({changed} rows corrected)")
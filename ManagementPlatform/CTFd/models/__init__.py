@@ -1255,3 +1255,29 @@ class Brackets(db.Model):
     name = db.Column(db.String(255))
     description = db.Column(db.Text)
     type = db.Column(db.String(80))
+
+
+class Standings(db.Model):
+    """
+    Materialized scoreboard. One row per account and account type ("users" or "teams") holding the
+    same aggregate that used to be computed from Solves and Awards on every standings request.
+
+    Rows are maintained incrementally by the listeners in CTFd.utils.scores.standings. last_id is NULL
+    until the account has scored something so that accounts without any scoring events stay off the board.
+    """
+
+    __tablename__ = "standings"
+    __table_args__ = (
+        db.UniqueConstraint("type", "account_id"),
+        db.Index("standings_type_score_idx", "type", "score"),
+        {},
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    type = db.Column(db.String(32))
+    account_id = db.Column(db.Integer)
+    score = db.Column(db.Integer, default=0)
+    last_id = db.Column(db.Integer, nullable=True)
+    date = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return "<Standings %r %r %r>" % (self.type, self.account_id, self.score)
@@ -34,6 +34,7 @@ from CTFd.utils.migrations import (
     get_current_revision,
     stamp_latest_revision,
 )
+from CTFd.utils.scores.standings import rebuild_standings
 from CTFd.utils.uploads import get_uploader
 
 
@@ -462,6 +463,11 @@ def import_ctf(backup, erase=True):
     except Exception:
         print("Failed to enable foreign key checks. Continuing.")
 
+    # Raw table inserts bypass the listeners that maintain the standings table
+    set_import_status("rebuilding standings")
+    rebuild_standings()
+    db.session.commit()
+
     # Invalidate all cached data
     set_import_status("clearing caches")
     cache.clear()
@@ -1,13 +1,27 @@
-from sqlalchemy.sql.expression import union_all
-
 from CTFd.cache import cache
 from CTFd.models import Achievements, AwardBadges, Awards, Brackets, Challenges, Solves, Teams, Users, db
 from CTFd.utils import get_config
 from CTFd.utils.dates import unix_time_to_utc
 from CTFd.utils.modes import get_model
+from CTFd.utils.scores.standings import get_scores_aggregate, get_standings_subquery
 from sqlalchemy import func
 
 
+def _get_sumscores(account_type, admin=False):
+    """
+    Per account score, last scoring id and last scoring date as a subquery.
+
+    Scores are read from the materialized standings table. While the scoreboard is frozen the public
+    view needs the aggregate as of the freeze time so it is computed from Solves and Awards instead.
+    """
+    freeze = get_config("freeze")
+    if not admin and freeze:
+        return get_scores_aggregate(
+            account_type, freeze=unix_time_to_utc(freeze)
+        ).subquery("sumscores")
+    return get_standings_subquery(account_type)
+
+
 @cache.memoize(timeout=60)
 def get_standings(count=None, bracket_id=None, admin=False, fields=None):
     """
@@ -21,61 +35,7 @@ def get_standings(count=None, bracket_id=None, admin=False, fields=None):
     if fields is None:
         fields = []
     Model = get_model()
-    print(f"Arguments received: admin={admin}")
-    scores = (
-        db.session.query(
-            Solves.account_id.label("account_id"),
-            db.func.sum(Challenges.value).label("score"),
-            db.func.max(Solves.id).label("id"),
-            db.func.max(Solves.date).label("date"),
-        )
-        .join(Challenges)
-        .filter(Challenges.value != 0)
-        .group_by(Solves.account_id)
-    )
-
-    awards = (
-        db.session.query(
-            Awards.account_id.label("account_id"),
-            db.func.sum(Awards.value).label("score"),
-            db.func.max(Awards.id).label("id"),
-            db.func.max(Awards.date).label("date"),
-        )
-        .filter(Awards.value != 0)
-        .group_by(Awards.account_id)
-    )
-
-    """
-    Filter out solves and awards that are before a specific time point.
-    """
-    freeze = get_config("freeze")
-    
-
-    if not admin and freeze:
-        
-        scores = scores.filter(Solves.date < unix_time_to_utc(freeze))
-        awards = awards.filter(Awards.date < unix_time_to_utc(freeze))
-
-    """
-    Combine awards and solves with a union. They should have the same amount of columns
-    """
-    results = union_all(scores, awards).alias("results")
-
-    """
-    Sum each of the results by the team id to get their score.
-    """
-    print('a', scores)
-    print('b', awards)
-    sumscores = (
-        db.session.query(
-            results.columns.account_id,
-            db.func.sum(results.columns.score).label("score"),
-            db.func.max(results.columns.id).label("id"),
-            db.func.max(results.columns.date).label("date"),
-        )
-        .group_by(results.columns.account_id)
-        .subquery()
-    )
+    sumscores = _get_sumscores(get_config("user_mode"), admin=admin)
 
     """
     Admins can see scores for all users but the public cannot see banned users.
@@ -144,46 +104,7 @@ def get_standings(count=None, bracket_id=None, admin=False, fields=None):
 def get_team_standings(count=None, bracket_id=None, admin=False, fields=None):
     if fields is None:
         fields = []
-    scores = (
-        db.session.query(
-            Solves.team_id.label("team_id"),
-            db.func.sum(Challenges.value).label("score"),
-            db.func.max(Solves.id).label("id"),
-            db.func.max(Solves.date).label("date"),
-        )
-        .join(Challenges)
-        .filter(Challenges.value != 0)
-        .group_by(Solves.team_id)
-    )
-
-    awards = (
-        db.session.query(
-            Awards.team_id.label("team_id"),
-            db.func.sum(Awards.value).label("score"),
-            db.func.max(Awards.id).label("id"),
-            db.func.max(Awards.date).label("date"),
-        )
-        .filter(Awards.value != 0)
-        .group_by(Awards.team_id)
-    )
-
-    freeze = get_config("freeze")
-    if not admin and freeze:
-        scores = scores.filter(Solves.date < unix_time_to_utc(freeze))
-        awards = awards.filter(Awards.date < unix_time_to_utc(freeze))
-
-    results = union_all(scores, awards).alias("results")
-
-    sumscores = (
-        db.session.query(
-            results.columns.team_id,
-            db.func.sum(results.columns.score).label("score"),
-            db.func.max(results.columns.id).label("id"),
-            db.func.max(results.columns.date).label("date"),
-        )
-        .group_by(results.columns.team_id)
-        .subquery()
-    )
+    sumscores = _get_sumscores("teams", admin=admin)
 
     if admin:
         standings_query = (
@@ -196,7 +117,7 @@ def get_team_standings(count=None, bracket_id=None, admin=False, fields=None):
                 sumscores.columns.score,
                 *fields,
             )
-            .join(sumscores, Teams.id == sumscores.columns.team_id)
+            .join(sumscores, Teams.id == sumscores.columns.account_id)
             .order_by(
                 sumscores.columns.score.desc(),
                 sumscores.columns.date.asc(),
@@ -212,7 +133,7 @@ def get_team_standings(count=None, bracket_id=None, admin=False, fields=None):
                 sumscores.columns.score,
                 *fields,
             )
-            .join(sumscores, Teams.id == sumscores.columns.team_id)
+            .join(sumscores, Teams.id == sumscores.columns.account_id)
             .filter(Teams.banned == False)
             .filter(Teams.hidden == False)
             .order_by(
@@ -237,47 +158,7 @@ def get_team_standings(count=None, bracket_id=None, admin=False, fields=None):
 def get_user_standings(count=None, bracket_id=None, admin=False, fields=None):
     if fields is None:
         fields = []
-    scores = (
-        db.session.query(
-            Solves.user_id.label("user_id"),
-            db.func.sum(Challenges.value).label("score"),
-            db.func.max(Solves.id).label("id"),
-            db.func.max(Solves.date).label("date"),
-        )
-        .join(Challenges)
-        .filter(Challenges.value != 0)
-        .group_by(Solves.user_id)
-    )
-
-    awards = (
-        db.session.query(
-            Awards.user_id.label("user_id"),
-            db.func.sum(Awards.value).label("score"),
-            db.func.max(Awards.id).label("id"),
-            db.func.max(Awards.date).label("date"),
-        )
-        .filter(Awards.value != 0)
-        .group_by(Awards.user_id)
-    )
-
-    freeze = get_config("freeze")
-    if not admin and freeze:
-        print(freeze)
-        scores = scores.filter(Solves.date < unix_time_to_utc(freeze))
-        awards = awards.filter(Awards.date < unix_time_to_utc(freeze))
-
-    results = union_all(scores, awards).alias("results")
-
-    sumscores = (
-        db.session.query(
-            results.columns.user_id,
-            db.func.sum(results.columns.score).label("score"),
-            db.func.max(results.columns.id).label("id"),
-            db.func.max(results.columns.date).label("date"),
-        )
-        .group_by(results.columns.user_id)
-        .subquery()
-    )
+    sumscores = _get_sumscores("users", admin=admin)
 
     if admin:
         standings_query = (
@@ -291,7 +172,7 @@ def get_user_standings(count=None, bracket_id=None, admin=False, fields=None):
                 sumscores.columns.score,
                 *fields,
             )
-            .join(sumscores, Users.id == sumscores.columns.user_id)
+            .join(sumscores, Users.id == sumscores.columns.account_id)
             .order_by(
                 sumscores.columns.score.desc(),
                 sumscores.columns.date.asc(),
@@ -308,7 +189,7 @@ def get_user_standings(count=None, bracket_id=None, admin=False, fields=None):
                 sumscores.columns.score,
                 *fields,
             )
-            .join(sumscores, Users.id == sumscores.columns.user_id)
+            .join(sumscores, Users.id == sumscores.columns.account_id)
             .filter(Users.banned == False, Users.hidden == False)
             .order_by(
                 sumscores.columns.score.desc(),
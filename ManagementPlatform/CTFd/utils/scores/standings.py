@@ -0,0 +1,405 @@
+from sqlalchemy import and_, case, event, func, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from sqlalchemy.sql.expression import union_all
+
+from CTFd.models import (
+    Awards,
+    Challenges,
+    Fails,
+    Solves,
+    Standings,
+    Submissions,
+    Teams,
+    Users,
+    db,
+)
+
+ACCOUNT_TYPES = ("users", "teams")
+
+# Session.info key used to defer a full rebuild until the transaction commits
+REBUILD_FLAG = "standings_rebuild"
+
+
+def _account_columns(account_type):
+    solves = Solves.__table__
+    awards = Awards.__table__
+    if account_type == "teams":
+        return solves.c.team_id, awards.c.team_id
+    return solves.c.user_id, awards.c.user_id
+
+
+def get_scores_aggregate(account_type, account_id=None, freeze=None):
+    """
+    Build the Solves + Awards aggregate for an account type.
+
+    This is the query the scoreboard used to run on every request. It is still used for full rebuilds,
+    single account recalculations and for the public scoreboard while it is frozen.
+    Returns a select with the columns account_id, score, id and date.
+    """
+    solves = Solves.__table__
+    submissions = Submissions.__table__
+    challenges = Challenges.__table__
+    awards = Awards.__table__
+    solve_account, award_account = _account_columns(account_type)
+
+    scores = (
+        select(
+            solve_account.label("account_id"),
+            func.sum(challenges.c.value).label("score"),
+            func.max(solves.c.id).label("id"),
+            func.max(submissions.c.date).label("date"),
+        )
+        .select_from(
+            solves.join(submissions, submissions.c.id == solves.c.id).join(
+                challenges, challenges.c.id == solves.c.challenge_id
+            )
+        )
+        .where(challenges.c.value != 0, solve_account.isnot(None))
+        .group_by(solve_account)
+    )
+
+    awards_q = (
+        select(
+            award_account.label("account_id"),
+            func.sum(awards.c.value).label("score"),
+            func.max(awards.c.id).label("id"),
+            func.max(awards.c.date).label("date"),
+        )
+        .where(awards.c.value != 0, award_account.isnot(None))
+        .group_by(award_account)
+    )
+
+    if account_id is not None:
+        scores = scores.where(solve_account == account_id)
+        awards_q = awards_q.where(award_account == account_id)
+
+    if freeze is not None:
+        scores = scores.where(submissions.c.date < freeze)
+        awards_q = awards_q.where(awards.c.date < freeze)
+
+    results = union_all(scores, awards_q).subquery("results")
+
+    return select(
+        results.c.account_id,
+        func.sum(results.c.score).label("score"),
+        func.max(results.c.id).label("id"),
+        func.max(results.c.date).label("date"),
+    ).group_by(results.c.account_id)
+
+
+def get_standings_subquery(account_type):
+    """
+    Materialized equivalent of get_scores_aggregate(account_type).subquery()
+    """
+    return (
+        db.session.query(
+            Standings.account_id.label("account_id"),
+            Standings.score.label("score"),
+            Standings.last_id.label("id"),
+            Standings.date.label("date"),
+        )
+        .filter(Standings.type == account_type, Standings.last_id.isnot(None))
+        .subquery()
+    )
+
+
+def _upsert(connection, account_type, account_id, values):
+    standings = Standings.__table__
+    result = connection.execute(
+        standings.update()
+        .where(
+            standings.c.type == account_type, standings.c.account_id == account_id
+        )
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            standings.insert().values(type=account_type, account_id=account_id, **values)
+        )
+
+
+def add_score(connection, account_type, account_id, value, row_id, date):
+    """
+    Add a single scoring event to an account's standing.
+
+    last_id and date keep the maximum seen so tie breaking stays identical to the aggregate query.
+    """
+    if account_id is None or not value:
+        return
+    standings = Standings.__table__
+    result = connection.execute(
+        standings.update()
+        .where(
+            standings.c.type == account_type, standings.c.account_id == account_id
+        )
+        .values(
+            score=standings.c.score + value,
+            last_id=case(
+                (
+                    or_(standings.c.last_id.is_(None), standings.c.last_id < row_id),
+                    row_id,
+                ),
+                else_=standings.c.last_id,
+            ),
+            date=case(
+                (
+                    or_(standings.c.date.is_(None), standings.c.date < date),
+                    date,
+                ),
+                else_=standings.c.date,
+            ),
+        )
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            standings.insert().values(
+                type=account_type,
+                account_id=account_id,
+                score=value,
+                last_id=row_id,
+                date=date,
+            )
+        )
+
+
+def recalculate_account(connection, account_type, account_id):
+    """
+    Recompute a single account's standing from its Solves and Awards
+    """
+    if account_id is None:
+        return
+    row = connection.execute(
+        get_scores_aggregate(account_type, account_id=account_id)
+    ).first()
+    if row is None:
+        values = {"score": 0, "last_id": None, "date": None}
+    else:
+        values = {"score": row.score or 0, "last_id": row.id, "date": row.date}
+    _upsert(connection, account_type, account_id, values)
+
+
+def rebuild_standings(connection=None):
+    """
+    Recompute the entire standings table from Solves and Awards.
+
+    Returns the number of rows that had to be created, corrected or removed. On a consistent table this is 0.
+    """
+    if connection is None:
+        connection = db.session.connection()
+
+    standings = Standings.__table__
+    changed = 0
+    for account_type in ACCOUNT_TYPES:
+        Model = Teams if account_type == "teams" else Users
+        expected = {
+            r.account_id: (int(r.score or 0), r.id, r.date)
+            for r in connection.execute(get_scores_aggregate(account_type))
+        }
+        for account_id in connection.execute(select(Model.__table__.c.id)).scalars():
+            expected.setdefault(account_id, (0, None, None))
+
+        current = {
+            r.account_id: (r.score, r.last_id, r.date)
+            for r in connection.execute(
+                select(
+                    standings.c.account_id,
+                    standings.c.score,
+                    standings.c.last_id,
+                    standings.c.date,
+                ).where(standings.c.type == account_type)
+            )
+        }
+
+        for account_id in set(current) - set(expected):
+            connection.execute(
+                standings.delete().where(
+                    standings.c.type == account_type,
+                    standings.c.account_id == account_id,
+                )
+            )
+            changed += 1
+
+        for account_id, (score, last_id, date) in expected.items():
+            if current.get(account_id) == (score, last_id, date):
+                continue
+            _upsert(
+                connection,
+                account_type,
+                account_id,
+                {"score": score, "last_id": last_id, "date": date},
+            )
+            changed += 1
+
+    return changed
+
+
+def _solvers(connection, challenge_id):
+    solves = Solves.__table__
+    return connection.execute(
+        select(solves.c.user_id, solves.c.team_id).where(
+            solves.c.challenge_id == challenge_id
+        )
+    ).all()
+
+
+@event.listens_for(Users, "after_insert", propagate=True)
+def _user_created(mapper, connection, target):
+    # Create the row up front so that concurrent first solves only ever need an UPDATE
+    _upsert(connection, "users", target.id, {"score": 0})
+
+
+@event.listens_for(Teams, "after_insert")
+def _team_created(mapper, connection, target):
+    _upsert(connection, "teams", target.id, {"score": 0})
+
+
+@event.listens_for(Users, "after_delete", propagate=True)
+def _user_deleted(mapper, connection, target):
+    standings = Standings.__table__
+    connection.execute(
+        standings.delete().where(
+            standings.c.type == "users", standings.c.account_id == target.id
+        )
+    )
+    # The user's solves and awards are removed by ON DELETE CASCADE which also changes the team's score
+    recalculate_account(connection, "teams", target.team_id)
+
+
+@event.listens_for(Teams, "after_delete")
+def _team_deleted(mapper, connection, target):
+    standings = Standings.__table__
+    connection.execute(
+        standings.delete().where(
+            standings.c.type == "teams", standings.c.account_id == target.id
+        )
+    )
+
+
+@event.listens_for(Solves, "after_insert")
+def _solve_created(mapper, connection, target):
+    challenges = Challenges.__table__
+    value = connection.execute(
+        select(challenges.c.value).where(challenges.c.id == target.challenge_id)
+    ).scalar()
+    add_score(connection, "users", target.user_id, value, target.id, target.date)
+    add_score(connection, "teams", target.team_id, value, target.id, target.date)
+
+
+@event.listens_for(Submissions, "after_delete", propagate=True)
+def _submission_deleted(mapper, connection, target):
+    if not isinstance(target, Solves):
+        return
+    recalculate_account(connection, "users", target.user_id)
+    recalculate_account(connection, "teams", target.team_id)
+
+
+@event.listens_for(Awards, "after_insert", propagate=True)
+def _award_created(mapper, connection, target):
+    add_score(connection, "users", target.user_id, target.value, target.id, target.date)
+    add_score(connection, "teams", target.team_id, target.value, target.id, target.date)
+
+
+@event.listens_for(Awards, "after_update", propagate=True)
+def _award_updated(mapper, connection, target):
+    accounts = set()
+    for attr, account_type in (("user_id", "users"), ("team_id", "teams")):
+        history = get_history(target, attr)
+        for account_id in history.sum():
+            accounts.add((account_type, account_id))
+    for account_type, account_id in accounts:
+        recalculate_account(connection, account_type, account_id)
+
+
+@event.listens_for(Awards, "after_delete", propagate=True)
+def _award_deleted(mapper, connection, target):
+    recalculate_account(connection, "users", target.user_id)
+    recalculate_account(connection, "teams", target.team_id)
+
+
+@event.listens_for(Challenges, "after_update", propagate=True)
+def _challenge_updated(mapper, connection, target):
+    history = get_history(target, "value")
+    if not history.has_changes():
+        return
+
+    # The previous value is unknown if the attribute was expired when it was assigned
+    old = history.deleted[0] if history.deleted else None
+    new = target.value or 0
+    if old == new:
+        return
+
+    solvers = _solvers(connection, target.id)
+    if not solvers:
+        return
+
+    if old and new:
+        # Every solver already had this challenge counted so only the score moves. Tie breaks are unchanged.
+        standings = Standings.__table__
+        solves = Solves.__table__
+        connection.execute(
+            standings.update()
+            .where(
+                or_(
+                    and_(
+                        standings.c.type == "users",
+                        standings.c.account_id.in_(
+                            select(solves.c.user_id).where(
+                                solves.c.challenge_id == target.id
+                            )
+                        ),
+                    ),
+                    and_(
+                        standings.c.type == "teams",
+                        standings.c.account_id.in_(
+                            select(solves.c.team_id).where(
+                                solves.c.challenge_id == target.id
+                            )
+                        ),
+                    ),
+                )
+            )
+            .values(score=standings.c.score + (new - old))
+        )
+    else:
+        # The challenge moved in or out of the zero value filter which affects last_id and date
+        for user_id, team_id in solvers:
+            recalculate_account(connection, "users", user_id)
+            recalculate_account(connection, "teams", team_id)
+
+
+SCORING_MODELS = (Submissions, Awards, Challenges, Users, Teams)
+
+
+def _is_scoring_mapper(mapper):
+    cls = getattr(mapper, "class_", None)
+    if cls is None or not issubclass(cls, SCORING_MODELS):
+        return False
+    # Deleting failed submissions can never change standings
+    return not issubclass(cls, Fails)
+
+
+@event.listens_for(Session, "after_bulk_delete")
+def _bulk_delete(delete_context):
+    if _is_scoring_mapper(delete_context.mapper):
+        delete_context.session.info[REBUILD_FLAG] = True
+
+
+@event.listens_for(Session, "after_bulk_update")
+def _bulk_update(update_context):
+    cls = getattr(update_context.mapper, "class_", None)
+    if cls is not None and issubclass(cls, (Challenges, Awards, Solves)):
+        update_context.session.info[REBUILD_FLAG] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_before_commit(session):
+    # Query.delete() and Query.update() bypass the row level listeners above.
+    # Several bulk deletes usually run back to back (e.g. deleting a user) so rebuild once per transaction.
+    if session.info.pop(REBUILD_FLAG, False):
+        rebuild_standings(connection=session.connection())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rebuild(session):
+    session.info.pop(REBUILD_FLAG, None)
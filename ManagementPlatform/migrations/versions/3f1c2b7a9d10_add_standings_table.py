@@ -0,0 +1,72 @@
+"""Add standings table
+
+Revision ID: 3f1c2b7a9d10
+Revises: e1667c4453e3
+Create Date: 2026-10-17 09:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2b7a9d10"
+down_revision = "e1667c4453e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "standings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(length=32), nullable=True),
+        sa.Column("account_id", sa.Integer(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("last_id", sa.Integer(), nullable=True),
+        sa.Column("date", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("type", "account_id"),
+    )
+    op.create_index(
+        "standings_type_score_idx", "standings", ["type", "score"], unique=False
+    )
+
+    # Seed the table with the same aggregate the scoreboard used to compute per request
+    for account_type, column in (("users", "user_id"), ("teams", "team_id")):
+        op.execute(
+            f"""
+            INSERT INTO standings (type, account_id, score, last_id, date)
+            SELECT '{account_type}', results.account_id, SUM(results.score), MAX(results.id), MAX(results.date)
+            FROM (
+                SELECT solves.{column} AS account_id, SUM(challenges.value) AS score,
+                       MAX(solves.id) AS id, MAX(submissions.date) AS date
+                FROM solves
+                JOIN submissions ON submissions.id = solves.id
+                JOIN challenges ON challenges.id = solves.challenge_id
+                WHERE challenges.value != 0 AND solves.{column} IS NOT NULL
+                GROUP BY solves.{column}
+                UNION ALL
+                SELECT awards.{column} AS account_id, SUM(awards.value) AS score,
+                       MAX(awards.id) AS id, MAX(awards.date) AS date
+                FROM awards
+                WHERE awards.value != 0 AND awards.{column} IS NOT NULL
+                GROUP BY awards.{column}
+            ) results
+            GROUP BY results.account_id
+            """
+        )
+        op.execute(
+            f"""
+            INSERT INTO standings (type, account_id, score)
+            SELECT '{account_type}', {account_type}.id, 0
+            FROM {account_type}
+            WHERE {account_type}.id NOT IN (
+                SELECT account_id FROM standings WHERE type = '{account_type}'
+            )
+            """
+        )
+
+
+def downgrade():
+    op.drop_index("standings_type_score_idx", table_name="standings")
+    op.drop_table("standings")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from CTFd.cache import INVALIDATIONS, clear_standings, invalidate
+from CTFd.models import Awards, Fails, Solves, Users
+from CTFd.utils.scores import get_standings
+from CTFd.utils.security.auth import generate_user_token
+from tests.helpers import (
+    create_ctfd,
+    destroy_ctfd,
+    gen_challenge,
+    gen_flag,
+    gen_user,
+)
+
+
+def scores(standings):
+    return [(s.account_id, int(s.score)) for s in standings]
+
+
+def add(db, obj):
+    # Insert without going through the helpers since they clear the caches themselves
+    db.session.add(obj)
+    db.session.commit()
+
+
+def test_invalidations_cover_known_events():
+    """Every event maps to clearing functions and fails clear nothing"""
+    assert INVALIDATIONS["fail"] == ()
+    for event in ("solve", "award", "unlock", "challenge_edit", "account_edit"):
+        assert clear_standings in INVALIDATIONS[event]
+
+
+def test_fail_does_not_clear_standings():
+    """A wrong flag keeps the memoized standings"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        cached = get_standings()
+        assert cached == []
+
+        add(app.db, Fails(user_id=2, challenge_id=chal.id, ip="127.0.0.1", provided="wrong"))
+        invalidate("fail")
+        assert get_standings() == cached
+
+        # Sneak a solve in to prove the memoized value really is still being served
+        add(app.db, Solves(user_id=2, challenge_id=chal.id, ip="127.0.0.1", provided="flag"))
+        invalidate("fail")
+        assert get_standings() == cached
+
+        invalidate("solve")
+        assert scores(get_standings()) == [(2, 100)]
+    destroy_ctfd(app)
+
+
+def test_scoreboard_stays_correct_across_events():
+    """After each event's invalidation the cached standings match a fresh computation"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        gen_user(app.db, name="user2", email="user2@examplectf.com")
+        chal1 = gen_challenge(app.db, user_id=1, value=100)
+        chal2 = gen_challenge(app.db, user_id=1, value=200)
+
+        events = [
+            ("fail", Fails(user_id=2, challenge_id=chal1.id, provided="wrong")),
+            ("solve", Solves(user_id=2, challenge_id=chal1.id, provided="flag")),
+            ("fail", Fails(user_id=3, challenge_id=chal2.id, provided="wrong")),
+            ("solve", Solves(user_id=3, challenge_id=chal2.id, provided="flag")),
+            ("award", Awards(user_id=2, name="bonus", value=150)),
+            ("unlock", Awards(user_id=3, name="hint", value=-25)),
+        ]
+        for event, obj in events:
+            get_standings()
+            add(app.db, obj)
+            invalidate(event)
+            assert get_standings() == get_standings.uncached()
+
+        assert scores(get_standings()) == [(2, 250), (3, 175)]
+
+        get_standings()
+        user = Users.query.filter_by(id=2).first()
+        user.hidden = True
+        app.db.session.commit()
+        invalidate("account_edit")
+        assert scores(get_standings()) == [(3, 175)]
+
+        from CTFd.utils.challenges import get_solve_counts_for_challenges
+
+        get_solve_counts_for_challenges()
+        invalidate("account_edit")
+        assert get_solve_counts_for_challenges() == {chal2.id: 1}
+    destroy_ctfd(app)
+
+
+def test_wrong_attempt_keeps_standings_cached():
+    """Submitting a wrong flag through the API does not invalidate the scoreboard"""
+    app = create_ctfd()
+    with app.app_context():
+        user = gen_user(app.db, name="user1", email="user1@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        gen_flag(app.db, challenge_id=chal.id, content="flag")
+        token = generate_user_token(
+            user, expiration=datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        )
+        headers = {"Authorization": f"Bearer {token.value}"}
+
+        cached = get_standings()
+        add(app.db, Solves(user_id=2, challenge_id=chal.id, provided="flag"))
+
+        with app.test_client() as client:
+            r = client.post(
+                "/api/v1/challenges/attempt",
+                json={"challenge_id": chal.id, "submission": "wrong"},
+                headers=headers,
+            )
+            assert r.status_code == 200
+        assert get_standings() == cached
+    destroy_ctfd(app)
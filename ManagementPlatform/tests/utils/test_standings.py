@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from CTFd.cache import clear_standings
+from CTFd.models import Awards, Challenges, Solves, Standings, Submissions, Users
+from CTFd.utils import set_config
+from CTFd.utils.scores import get_standings, get_user_standings
+from CTFd.utils.scores.standings import get_scores_aggregate, rebuild_standings
+from tests.helpers import (
+    create_ctfd,
+    destroy_ctfd,
+    gen_award,
+    gen_challenge,
+    gen_solve,
+    gen_team,
+    gen_user,
+)
+
+
+def materialized(db, account_type="users"):
+    return {
+        s.account_id: (s.score, s.last_id, s.date)
+        for s in Standings.query.filter(
+            Standings.type == account_type, Standings.last_id.isnot(None)
+        )
+    }
+
+
+def aggregated(db, account_type="users"):
+    return {
+        r.account_id: (int(r.score), r.id, r.date)
+        for r in db.session.execute(get_scores_aggregate(account_type))
+    }
+
+
+def test_standings_match_aggregate_on_solves_and_awards():
+    """Solves and awards incrementally update the standings table"""
+    app = create_ctfd()
+    with app.app_context():
+        for i in range(3):
+            gen_user(app.db, name=f"user{i}", email=f"user{i}@examplectf.com")
+        chal1 = gen_challenge(app.db, user_id=1, value=100)
+        chal2 = gen_challenge(app.db, user_id=1, value=200)
+        gen_challenge(app.db, user_id=1, value=0)
+
+        gen_solve(app.db, user_id=2, challenge_id=chal1.id)
+        gen_solve(app.db, user_id=3, challenge_id=chal2.id)
+        gen_solve(app.db, user_id=2, challenge_id=3)
+        gen_award(app.db, user_id=2, value=100)
+        gen_award(app.db, user_id=4, value=0)
+
+        assert materialized(app.db) == aggregated(app.db)
+        assert materialized(app.db)[2][0] == 200
+
+        # User 3 reached 200 before user 2 so they win the tie
+        standings = get_standings()
+        assert [s.account_id for s in standings] == [3, 2]
+        assert [s.score for s in standings] == [200, 200]
+        assert rebuild_standings() == 0
+    destroy_ctfd(app)
+
+
+def test_standings_follow_challenge_value_changes():
+    """Changing a challenge value moves the score of every solver"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        gen_user(app.db, name="user2", email="user2@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        gen_solve(app.db, user_id=2, challenge_id=chal.id)
+        gen_solve(app.db, user_id=3, challenge_id=chal.id)
+
+        chal = Challenges.query.filter_by(id=chal.id).first()
+        chal.value = 50
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db)
+        assert materialized(app.db)[2][0] == 50
+
+        chal = Challenges.query.filter_by(id=chal.id).first()
+        chal.value = 0
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db) == {}
+
+        chal = Challenges.query.filter_by(id=chal.id).first()
+        chal.value = 75
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db)
+        assert materialized(app.db)[3][0] == 75
+    destroy_ctfd(app)
+
+
+def test_standings_follow_deletions():
+    """Deleting solves and awards recalculates the affected accounts"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        gen_user(app.db, name="user2", email="user2@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        solve = gen_solve(app.db, user_id=2, challenge_id=chal.id)
+        gen_solve(app.db, user_id=3, challenge_id=chal.id)
+        award = gen_award(app.db, user_id=2, value=25)
+
+        app.db.session.delete(Awards.query.filter_by(id=award.id).first())
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db)
+        assert materialized(app.db)[2][0] == 100
+
+        app.db.session.delete(Solves.query.filter_by(id=solve.id).first())
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db)
+        assert 2 not in materialized(app.db)
+
+        # Bulk deletes skip the row level listeners and trigger a rebuild on commit
+        Submissions.query.filter_by(user_id=3).delete()
+        Solves.query.filter_by(user_id=3).delete()
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db) == {}
+    destroy_ctfd(app)
+
+
+def test_standings_team_mode():
+    """Team standings are maintained from the team_id of solves and awards"""
+    app = create_ctfd(user_mode="teams")
+    with app.app_context():
+        team = gen_team(app.db, member_count=2)
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        members = [m.id for m in team.members]
+        gen_solve(app.db, user_id=members[0], team_id=team.id, challenge_id=chal.id)
+        gen_award(app.db, user_id=members[1], team_id=team.id, value=50)
+
+        assert materialized(app.db, "teams") == aggregated(app.db, "teams")
+        assert materialized(app.db, "users") == aggregated(app.db, "users")
+        standings = get_standings()
+        assert standings[0].account_id == team.id
+        assert standings[0].score == 150
+    destroy_ctfd(app)
+
+
+def test_rebuild_standings_repairs_table():
+    """rebuild_standings corrects drifted rows and reports how many it fixed"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        gen_solve(app.db, user_id=2, challenge_id=chal.id)
+
+        app.db.session.execute(Standings.__table__.delete())
+        app.db.session.commit()
+        assert materialized(app.db) == {}
+
+        assert rebuild_standings() > 0
+        app.db.session.commit()
+        assert materialized(app.db) == aggregated(app.db)
+        assert rebuild_standings() == 0
+
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=["rebuild_standings", "--check"])
+        assert result.exit_code == 0
+        assert "0 standings rows are out of date" in result.output
+    destroy_ctfd(app)
+
+
+def test_frozen_standings_use_aggregate():
+    """Public standings while frozen ignore scores after the freeze time"""
+    app = create_ctfd()
+    with app.app_context():
+        gen_user(app.db, name="user1", email="user1@examplectf.com")
+        chal = gen_challenge(app.db, user_id=1, value=100)
+        gen_solve(app.db, user_id=2, challenge_id=chal.id)
+        set_config("freeze", "1507262400")
+        clear_standings()
+
+        assert get_user_standings() == []
+        assert get_user_standings(admin=True)[0].score == 100
+        assert Users.query.filter_by(id=2).first().get_score(admin=True) == 100
+    destroy_ctfd(app)